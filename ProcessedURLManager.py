@@ -1,8 +1,22 @@
 import os
+from functools import lru_cache
 from typing import List, Dict, Set
 from datetime import datetime
+from urllib.parse import urlsplit, urlunsplit
 
 
+@lru_cache(maxsize=100_000)
+def canonicalize_url(url: str) -> str:
+    """
+    Reduce a document URL to the form used for de-duplication
+    Args:
+        url: Document URL
+    Returns:
+        str: URL with lowercase scheme and host, no trailing slash, query or fragment
+    """
+    parts = urlsplit(url.strip())
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path.rstrip('/'), '', ''))
+
 
 class ProcessedURLManager:
     def __init__(self, log_file: str = None):
@@ -15,6 +29,7 @@ class ProcessedURLManager:
         self.log_file = log_file
         self.processed_urls: Set[str] = set()
         self.category_urls: Dict[str, Dict[str, Set[str]]] = {}
+        self._urls_fh = None
         self.load_processed_urls()
         
     
@@ -26,14 +41,11 @@ class ProcessedURLManager:
                     for line in f:
                         try:
                             category, subcategory, url = line.strip().split('|')
+                            url = canonicalize_url(url)
                             self.processed_urls.add(url)
                             
                             # Organize by category and subcategory
-                            if category not in self.category_urls:
-                                self.category_urls[category] = {}
-                            if subcategory not in self.category_urls[category]:
-                                self.category_urls[category][subcategory] = set()
-                            self.category_urls[category][subcategory].add(url)
+                            self.category_urls.setdefault(category, {}).setdefault(subcategory, set()).add(url)
                             
                         except ValueError:
                             self.log_message(f"Invalid line format: {line}")
@@ -54,6 +66,8 @@ class ProcessedURLManager:
             bool: Success status
         """
         try:
+            url = canonicalize_url(url)
+            
             # Check if URL is already processed
             if url in self.processed_urls:
                 self.log_message(f"URL already processed: {url}")
@@ -62,19 +76,15 @@ class ProcessedURLManager:
             # Add to memory
             self.processed_urls.add(url)
             
-            # Add to category tracking
-            if category not in self.category_urls:
-                self.category_urls[category] = {}
-            if subcategory not in self.category_urls[category]:
-                self.category_urls[category][subcategory] = set()
-            
             # Add URL to category tracking
-            self.category_urls[category][subcategory].add(url)
+            self.category_urls.setdefault(category, {}).setdefault(subcategory, set()).add(url)
             
-            # Write to file atomically
+            # Append to the file through one handle kept open for the session;
+            # line buffering still writes every URL out as soon as it is added
             try:
-                with open(self.processed_urls_file, 'a') as f:
-                    f.write(f"{category}|{subcategory}|{url}\n")
+                if self._urls_fh is None:
+                    self._urls_fh = open(self.processed_urls_file, 'a', buffering=1)
+                self._urls_fh.write(f"{category}|{subcategory}|{url}\n")
             except Exception as e:
                 # Rollback memory changes if file write fails
                 self.processed_urls.remove(url)
@@ -98,7 +108,17 @@ class ProcessedURLManager:
         Returns:
             bool: True if already processed
         """
-        return url in self.processed_urls
+        return canonicalize_url(url) in self.processed_urls
+
+    def are_processed(self, urls: List[str]) -> Set[str]:
+        """
+        Check a batch of URLs in one pass
+        Args:
+            urls: URLs to check
+        Returns:
+            set: Canonical forms of the urls that have already been processed
+        """
+        return self.processed_urls.intersection(map(canonicalize_url, urls))
 
     def get_category_urls(self, category: str, subcategory: str = None) -> Set[str]:
         """
@@ -158,7 +178,10 @@ class ProcessedURLManager:
 
     def cleanup(self) -> None:
         """Perform any necessary cleanup"""
-        # Currently just logs stats
+        if self._urls_fh is not None:
+            self._urls_fh.close()
+            self._urls_fh = None
+        
         stats = self.get_stats()
         self.log_message("\nProcessed URLs Statistics:")
         self.log_message(f"Total URLs: {stats['total_urls']}")
@@ -1,17 +1,37 @@
 import json
-import datetime
 import os
+import time
+import atexit
+import queue
+import threading
 from typing import Dict, Any
 
+try:
+    import orjson
+except ImportError:  # Fall back to the stdlib encoder
+    orjson = None
+
+TIMESTAMP_FORMAT = '%Y%m%d_%H%M%S'
+DATE_FORMAT = '%Y-%m-%d'
+
 class ProgressTracker:
-    def __init__(self, log_dir: str = 'logs'):
+    def __init__(self, log_dir: str = 'logs', verbose: bool = True):
         """Initialize Progress Tracker"""
         self.log_dir = log_dir
+        self.verbose = verbose
+        # Downloads needed before a subcategory counts as complete
+        self.required_downloads = 2
         self.progress_file = os.path.join(log_dir, 'search_progress.json')
         self.session_log = os.path.join(log_dir, f'session_{self.get_timestamp()}.log')
 
         if not os.path.exists(log_dir):
             os.makedirs(log_dir)
+
+        # Keep the session log open; writes are buffered and flushed on close or error.
+        # The writer thread logs too, so writes go through a lock
+        self._log_fh = open(self.session_log, 'a', buffering=8192)
+        self._log_lock = threading.Lock()
+        atexit.register(self._log_fh.close)
             
         self.progress_data = {
             'last_session': self.get_timestamp(),
@@ -22,10 +42,11 @@ class ProgressTracker:
                 'subcategory': None
             },
             'completed': {
-                'categories': [],
-                'subcategories': {},  # Format: {'category': ['subcategory1', 'subcategory2']}
+                'categories': set(),
+                'subcategories': {},  # Format: {'category': {'subcategory1', 'subcategory2'}}
                 'downloads': {}  # Format: {'category': {'subcategory': count}}
             },
+            'daily_downloads': {},  # Format: {'YYYY-MM-DD': count}
             'statistics': {
                 'total_categories': 0,
                 'completed_categories': 0,
@@ -36,49 +57,160 @@ class ProgressTracker:
                 'total_downloads': 0
             },
             'last_processed': {
-                'category': None,
-                'subcategory': None,
                 'timestamp': None
             }
         }
         
+        # Batched flushing: frequent updates only mark the tracker dirty
+        self._dirty = False
+        self._updates_since_flush = 0
+        self._flush_every = 50
+        self._flush_interval = 5.0
+        self._last_flush = time.monotonic()
+
+        # Progress files are written by a background thread; serialized
+        # snapshots are numbered so an older one never overwrites a newer one
+        self._save_queue = queue.Queue(maxsize=1)
+        self._write_lock = threading.Lock()
+        self._save_seq = 0
+        self._written_seq = 0
+        self._writer = threading.Thread(target=self._writer_loop, daemon=True)
+        self._writer.start()
+
+        self._bind_sections()
         self.load_progress()
+        atexit.register(self.flush)
+
+    def _bind_sections(self):
+        """Bind frequently updated sections of progress_data to attributes"""
+        self._stats = self.progress_data['statistics']
+        self._pos = self.progress_data['current_position']
 
     def get_timestamp(self) -> str:
         """Generate timestamp for logging"""
-        return datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
+        return time.strftime(TIMESTAMP_FORMAT)
 
     def load_progress(self):
         """Load existing progress from file"""
         try:
             if os.path.exists(self.progress_file):
-                with open(self.progress_file, 'r') as f:
-                    saved_progress = json.load(f)
-                    self.progress_data.update(saved_progress)
+                if orjson:
+                    with open(self.progress_file, 'rb') as f:
+                        saved_progress = orjson.loads(f.read())
+                else:
+                    with open(self.progress_file, 'r') as f:
+                        saved_progress = json.load(f)
+                self.progress_data.update(saved_progress)
+                self._bind_sections()
+
+                # Completion markers are stored as lists but kept as sets in memory
+                completed = self.progress_data['completed']
+                completed['categories'] = set(completed['categories'])
+                completed['subcategories'] = {
+                    category: set(subs) for category, subs in completed['subcategories'].items()
+                }
                 self.log_message("Progress loaded successfully")
         except Exception as e:
             self.log_message(f"Error loading progress: {str(e)}")
 
-    def save_progress(self):
-        """Save progress to file"""
+    def _recompute_stats(self):
+        """Derive completion/download counters from the completed data"""
+        completed = self.progress_data['completed']
+        self._stats.update({
+            'completed_categories': len(completed['categories']),
+            'completed_subcategories': sum(len(subs) for subs in completed['subcategories'].values()),
+            'total_downloads': sum(sum(subs.values()) for subs in completed['downloads'].values())
+        })
+
+    def save_progress(self, durable: bool = False):
+        """
+        Save progress to file
+        Args:
+            durable: write and fsync on the calling thread instead of
+                handing the snapshot to the background writer
+        """
         try:
-            with open(self.progress_file, 'w') as f:
-                json.dump(self.progress_data, f, indent=4)
-            self.log_message("Progress saved successfully")
+            self._recompute_stats()
+            if orjson:
+                data = orjson.dumps(self.progress_data, default=sorted, option=orjson.OPT_INDENT_2)
+            else:
+                data = json.dumps(self.progress_data, indent=2, default=sorted).encode()
+            self._save_seq += 1
+            snapshot = (self._save_seq, data)
+            self._dirty = False
+            self._updates_since_flush = 0
+            self._last_flush = time.monotonic()
+
+            if durable:
+                self._write_snapshot(snapshot, durable=True)
+                return
+
+            # Only the newest snapshot matters: replace one still waiting
+            try:
+                self._save_queue.put_nowait(snapshot)
+            except queue.Full:
+                try:
+                    self._save_queue.get_nowait()
+                except queue.Empty:
+                    pass
+                self._save_queue.put_nowait(snapshot)
         except Exception as e:
             self.log_message(f"Error saving progress: {str(e)}")
-    
+
+    def _writer_loop(self):
+        """Background thread writing queued progress snapshots"""
+        while True:
+            snapshot = self._save_queue.get()
+            try:
+                self._write_snapshot(snapshot)
+            except Exception as e:
+                self.log_message(f"Error saving progress: {str(e)}")
+
+    def _write_snapshot(self, snapshot, durable: bool = False):
+        """Write a serialized snapshot unless a newer one is already on disk"""
+        seq, data = snapshot
+        with self._write_lock:
+            if seq <= self._written_seq:
+                return
+            # Write to a temp file and rename it over the old one so a crash
+            # mid-write never leaves a truncated progress file behind
+            tmp_file = self.progress_file + '.tmp'
+            with open(tmp_file, 'wb') as f:
+                f.write(data)
+                if durable:
+                    f.flush()
+                    os.fsync(f.fileno())
+            os.replace(tmp_file, self.progress_file)
+            self._written_seq = seq
+        self.log_message("Progress saved successfully")
+
+    def _mark_dirty(self):
+        """Record an update and save only once enough updates or time have accumulated"""
+        self._dirty = True
+        self._updates_since_flush += 1
+        if (self._updates_since_flush >= self._flush_every or
+                time.monotonic() - self._last_flush > self._flush_interval):
+            self.save_progress()
+
+    def flush(self):
+        """Durably save progress if there are unsaved or not yet written updates"""
+        if self._dirty or self._written_seq < self._save_seq:
+            self.save_progress(durable=True)
         
     def log_message(self, message: str):
         """Log a message with timestamp"""
         timestamp = self.get_timestamp()
         log_entry = f"[{timestamp}] {message}\n"
         try:
-            with open(self.session_log, 'a') as f:
-                f.write(log_entry)
+            with self._log_lock:
+                self._log_fh.write(log_entry)
+                # Errors are what a crash leaves to read, so don't hold them in the buffer
+                if message.startswith('Error'):
+                    self._log_fh.flush()
         except Exception as e:
             print(f"Error writing to log: {str(e)}")
-        print(log_entry.strip())
+        if self.verbose:
+            print(log_entry.strip())
         
     def get_total_subcategories(self, category: str) -> int:
         """Get total number of subcategories for a category"""
@@ -90,28 +222,29 @@ class ProgressTracker:
 
     def update_position(self, category: str, subcategory: str, category_index: int, subcategory_index: int):
         """Update current search position with names and indices"""
-        self.progress_data['current_position'].update({
+        current = self._pos
+        if (current['category'] == category and current['subcategory'] == subcategory and
+                current['category_index'] == category_index and
+                current['subcategory_index'] == subcategory_index):
+            # Same position as before (e.g. resumed run) - nothing to record
+            return
+
+        current.update({
             'category_index': category_index,
             'subcategory_index': subcategory_index,
             'category': category,
             'subcategory': subcategory
         })
-        self.progress_data['last_processed'] = {
-            'category': category,
-            'subcategory': subcategory,
-            'timestamp': self.get_timestamp()
-        }
-        self.save_progress()
+        self.progress_data['last_processed'] = {'timestamp': self.get_timestamp()}
+        self._mark_dirty()
 
     def mark_subcategory_complete(self, category: str, subcategory: str):
         """Mark a subcategory as completed"""
         try:
-            if category not in self.progress_data['completed']['subcategories']:
-                self.progress_data['completed']['subcategories'][category] = []
+            completed_subs = self.progress_data['completed']['subcategories'].setdefault(category, set())
                 
-            if subcategory not in self.progress_data['completed']['subcategories'][category]:
-                self.progress_data['completed']['subcategories'][category].append(subcategory)
-                self.progress_data['statistics']['completed_subcategories'] += 1
+            if subcategory not in completed_subs:
+                completed_subs.add(subcategory)
                 self.save_progress()
                 self.log_message(f"Marked subcategory {subcategory} as complete")
                 
@@ -121,22 +254,26 @@ class ProgressTracker:
             self.log_message(f"Error marking subcategory complete: {str(e)}")
             
 
-    def check_category_completion(self, category: str):
-        """Check if all subcategories in a category are complete"""
+    def check_category_completion(self, category: str) -> bool:
+        """Check if all subcategories in a category are complete, marking it if so"""
         try:
-            if category not in self.progress_data['completed']['categories']:
-                if self.is_category_complete(category):
-                    self.progress_data['completed']['categories'].append(category)
-                    self.progress_data['statistics']['completed_categories'] += 1
-                    self.save_progress()
-                    self.log_message(f"Category {category} marked as complete")
+            completed_categories = self.progress_data['completed']['categories']
+            if category in completed_categories:
+                return True
+            if self.is_category_complete(category):
+                completed_categories.add(category)
+                self.save_progress()
+                self.log_message(f"Category {category} marked as complete")
+                return True
+            return False
         except Exception as e:
             self.log_message(f"Error checking category completion: {str(e)}")
+            return False
 
     def is_category_complete(self, category: str) -> bool:
         """Check if a category is completed"""
         try:
-            completed_subs = self.progress_data['completed']['subcategories'].get(category, [])
+            completed_subs = self.progress_data['completed']['subcategories'].get(category, ())
             total_subs = self.get_total_subcategories(category)
             return len(completed_subs) == total_subs and total_subs > 0
         except Exception as e:
@@ -145,35 +282,36 @@ class ProgressTracker:
 
     def get_current_position(self) -> Dict[str, int]:
         """Get current position in search process"""
-        return self.progress_data['current_position']
+        return self._pos
 
     def update_search_progress(self, category: str, subcategory: str, success: bool):
         """Update progress for a search attempt"""
         if success:
-            self.progress_data['statistics']['successful_searches'] += 1
+            self._stats['successful_searches'] += 1
         else:
-            self.progress_data['statistics']['failed_searches'] += 1
-        self.save_progress()
+            self._stats['failed_searches'] += 1
+        self._mark_dirty()
 
     def get_progress_summary(self) -> Dict[str, Any]:
         """Get summary of current progress"""
+        self._recompute_stats()
         return {
-            'current_position': self.progress_data['current_position'],
-            'statistics': self.progress_data['statistics'],
+            'current_position': self._pos,
+            'statistics': self._stats,
             'completed_categories': len(self.progress_data['completed']['categories']),
-            'total_categories': self.progress_data['statistics']['total_categories']
+            'total_categories': self._stats['total_categories']
         }
     def record_download(self, category: str, subcategory: str, count: int = 1):
         """Record successful download"""
         try:
-            if category not in self.progress_data['completed']['downloads']:
-                self.progress_data['completed']['downloads'][category] = {}
-            if subcategory not in self.progress_data['completed']['downloads'][category]:
-                self.progress_data['completed']['downloads'][category][subcategory] = 0
-                
-            self.progress_data['completed']['downloads'][category][subcategory] += count
-            self.progress_data['statistics']['total_downloads'] += count
-            self.save_progress()
+            category_downloads = self.progress_data['completed']['downloads'].setdefault(category, {})
+            category_downloads[subcategory] = category_downloads.get(subcategory, 0) + count
+
+            # Keep a running per-day count so get_daily_count needs no walk
+            today = time.strftime(DATE_FORMAT)
+            daily_downloads = self.progress_data['daily_downloads']
+            daily_downloads[today] = daily_downloads.get(today, 0) + count
+            self._mark_dirty()
             
         except Exception as e:
             self.log_message(f"Error recording download: {str(e)}")
@@ -184,18 +322,17 @@ class ProgressTracker:
             total_categories = len(categories_data)
             total_subcategories = sum(len(subcats) for subcats in categories_data.values())
             
-            self.progress_data['statistics'].update({
+            self._stats.update({
                 'total_categories': total_categories,
                 'total_subcategories': total_subcategories
             })
             
-            # Initialize download tracking
+            # Initialize download tracking, keeping counts already recorded
+            downloads = self.progress_data['completed']['downloads']
             for category, subcategories in categories_data.items():
-                if category not in self.progress_data['completed']['downloads']:
-                    self.progress_data['completed']['downloads'][category] = {}
-                    for subcategory in subcategories:
-                        if subcategory not in self.progress_data['completed']['downloads'][category]:
-                            self.progress_data['completed']['downloads'][category][subcategory] = 0
+                category_downloads = downloads.setdefault(category, {})
+                for subcategory in subcategories:
+                    category_downloads.setdefault(subcategory, 0)
             
             self.save_progress()
             self.log_message(f"Initialized tracking for {total_categories} categories and {total_subcategories} subcategories")
@@ -205,28 +342,20 @@ class ProgressTracker:
             
     def get_resume_point(self) -> Dict[str, Any]:
         """Get point to resume processing"""
-        try:
-            current_pos = self.progress_data['current_position']
-            last_proc = self.progress_data['last_processed']
-            
-            return {
-                'category_index': current_pos['category_index'],
-                'subcategory_index': current_pos['subcategory_index'],
-                'category': current_pos['category'] or last_proc['category'],
-                'subcategory': current_pos['subcategory'] or last_proc['subcategory'],
-                'downloads': self.progress_data['completed']['downloads']
-            }
-            
-        except Exception as e:
-            self.log_message(f"Error getting resume point: {str(e)}")
-            return None
+        current_pos = self._pos
+        return {
+            'category_index': current_pos['category_index'],
+            'subcategory_index': current_pos['subcategory_index'],
+            'category': current_pos['category'],
+            'subcategory': current_pos['subcategory'],
+            'downloads': self.progress_data['completed']['downloads']
+        }
         
     def is_subcategory_complete(self, category: str, subcategory: str) -> bool:
         """Check if subcategory has required downloads"""
         try:
             downloads = self.progress_data['completed']['downloads'].get(category, {}).get(subcategory, 0)
-            required_downloads = 2  # Set explicit requirement
-            return downloads >= required_downloads
+            return downloads >= self.required_downloads
         except Exception as e:
             self.log_message(f"Error checking subcategory completion: {str(e)}")
             return False
@@ -241,15 +370,8 @@ class ProgressTracker:
     def get_daily_count(self) -> int:
         """Get today's download count"""
         try:
-            today = datetime.datetime.now().strftime("%Y-%m-%d")
-            daily_count = 0
-            
-            # Calculate today's downloads from completed downloads
-            for category in self.progress_data['completed']['downloads']:
-                for subcategory in self.progress_data['completed']['downloads'][category]:
-                    daily_count += self.progress_data['completed']['downloads'][category][subcategory]
-            
-            return daily_count
+            today = time.strftime(DATE_FORMAT)
+            return self.progress_data['daily_downloads'].get(today, 0)
         except Exception as e:
             self.log_message(f"Error getting daily count: {str(e)}")
             return 0
@@ -257,40 +379,46 @@ class ProgressTracker:
     def get_total_count(self) -> int:
         """Get total download count"""
         try:
-            return self.progress_data['statistics']['total_downloads']
+            self._recompute_stats()
+            return self._stats['total_downloads']
         except Exception as e:
             self.log_message(f"Error getting total count: {str(e)}")
             return 0
-    def print_stats(self) -> str:
-        """Print detailed statistics"""
-        try:
-            today = datetime.datetime.now().strftime("%Y-%m-%d")
-            stats_message = f"""
+    def format_stats(self) -> str:
+        """Build the detailed statistics message without logging it"""
+        self._recompute_stats()
+        today = time.strftime(DATE_FORMAT)
+        parts = [f"""
             Download Statistics:
-            Total Downloads: {self.progress_data['statistics']['total_downloads']}
+            Total Downloads: {self._stats['total_downloads']}
             Today's Downloads ({today}): {self.get_daily_count()}
             Last Updated: {self.progress_data['last_processed']['timestamp']}
 
     Category-wise Downloads:
-    """
-            # Add category statistics
-            for category in self.progress_data['completed']['downloads']:
-                stats_message += f"\n{category}:"
-                for subcategory, count in self.progress_data['completed']['downloads'][category].items():
-                    stats_message += f"\n  - {subcategory}: {count}"
-                
-            # Add completion statistics
-            stats_message += f"""
+    """]
+        # Add category statistics
+        for category, subcategories in self.progress_data['completed']['downloads'].items():
+            parts.append(f"\n{category}:")
+            for subcategory, count in subcategories.items():
+                parts.append(f"\n  - {subcategory}: {count}")
+
+        # Add completion statistics
+        parts.append(f"""
 
     Completion Status:
-    Total Categories: {self.progress_data['statistics']['total_categories']}
-    Completed Categories: {self.progress_data['statistics']['completed_categories']}
-    Total Subcategories: {self.progress_data['statistics']['total_subcategories']}
-    Completed Subcategories: {self.progress_data['statistics']['completed_subcategories']}
-    Successful Searches: {self.progress_data['statistics']['successful_searches']}
-    Failed Searches: {self.progress_data['statistics']['failed_searches']}
-    """
-            
+    Total Categories: {self._stats['total_categories']}
+    Completed Categories: {self._stats['completed_categories']}
+    Total Subcategories: {self._stats['total_subcategories']}
+    Completed Subcategories: {self._stats['completed_subcategories']}
+    Successful Searches: {self._stats['successful_searches']}
+    Failed Searches: {self._stats['failed_searches']}
+    """)
+        return ''.join(parts)
+
+    def print_stats(self) -> str:
+        """Print detailed statistics"""
+        try:
+            stats_message = self.format_stats()
             self.log_message(stats_message)
             return stats_message
             
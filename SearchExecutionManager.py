@@ -2,12 +2,67 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.keys import Keys
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, StaleElementReferenceException
+import atexit
+import collections
+import hashlib
+import json
+import logging
+import os
+import re
 import time
+import random
+from functools import lru_cache
+from urllib.parse import quote_plus, urlsplit
+
+try:
+    import requests
+    import lxml.html
+except ImportError:  # fall back to the browser for result pages
+    requests = None
+
+try:
+    import orjson
+except ImportError:  # Fall back to the stdlib encoder
+    orjson = None
 
 from ProgressTracker import ProgressTracker
-from ProcessedURLManager import ProcessedURLManager  # New import
+from ProcessedURLManager import ProcessedURLManager, canonicalize_url
+
+logger = logging.getLogger(__name__)
+
+@lru_cache(maxsize=256)
+def build_search_url(search_term):
+    """
+    Build the result page URL for a search term, quoting it once
+    Args:
+        search_term: Term to search
+    Returns:
+        str: Search URL
+    """
+    return f'https://www.scribd.com/search?query={quote_plus(search_term)}'
+
 
 class SearchExecutionManager:
+    # Document pages only; rejects /book/, /audiobook/ and other result types
+    _DOC_URL_RE = re.compile(r'https://www\.scribd\.com/document/\d+')
+
+    # Page selectors
+    _SEARCH_INPUT_LOCATOR = (By.CSS_SELECTOR, 'input[type="search"]')
+    _RESULTS_LOCATOR = (By.CSS_SELECTOR, 'div[class*="search-results"]')
+    _LINK_SELECTOR = 'a[class^="FluidCell-module_linkOverlay"]'
+    _LINK_XPATH = '//a[starts-with(@class, "FluidCell-module_linkOverlay")]'
+    _NO_RESULTS_XPATH = "//div[contains(text(), 'No results for')]"
+
+    # Result links and the no-results message, read together in one round-trip
+    _READ_RESULTS_SCRIPT = (
+        f"const links = Array.from(document.querySelectorAll('{_LINK_SELECTOR}'));"
+        f"const empty = document.evaluate(\"{_NO_RESULTS_XPATH}\", document, null,"
+        " XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue !== null;"
+        "return {found: links.length, empty: empty,"
+        " hrefs: links.map(a => a.href).filter(h => h.startsWith('https://www.scribd.com/document/'))};"
+    )
+
     def __init__(self, driver,config_manager, progress_tracker=None, url_manager=None,):
         """
         Initialize Search Execution Manager
@@ -18,16 +73,53 @@ class SearchExecutionManager:
         """
         self.driver = driver
         self.config_manager = config_manager
-        self.progress_tracker = progress_tracker if progress_tracker else ProgressTracker()
-        self.url_manager = url_manager if url_manager else ProcessedURLManager()
+        self.progress_tracker = progress_tracker if progress_tracker is not None else ProgressTracker()
+        self.url_manager = url_manager if url_manager is not None else ProcessedURLManager()
         
+        # The driver uses the 'eager' page-load strategy (ConfigManager.get_chrome_options):
+        # driver.get returns at DOMContentLoaded, before ads and analytics finish. The cost
+        # is that nothing on the page can be assumed ready, so every step below gates on
+        # an explicit wait bounded by wait_time instead.
         self.search_config = {
             'wait_time': 10,
             'min_results': 2,
             'max_results': 5,
-            'search_delay': 3
+            'cache_ttl': 24 * 60 * 60  # Seconds a term's result links are reused
         }
 
+        # Lookups return immediately; every wait in the search flow is explicit
+        self.driver.implicitly_wait(0)
+
+        # Reused across searches
+        self._wait = WebDriverWait(
+            self.driver,
+            self.search_config['wait_time'],
+            poll_frequency=0.2,
+            ignored_exceptions=(NoSuchElementException, StaleElementReferenceException)
+        )
+        # Results usually land well inside the default poll interval, so poll them tighter
+        self._results_wait = WebDriverWait(
+            self.driver,
+            self.search_config['wait_time'],
+            poll_frequency=0.1,
+            ignored_exceptions=(NoSuchElementException, StaleElementReferenceException)
+        )
+
+        # Result links per search term, kept across runs;
+        # SEARCH_CACHE_REFRESH=1 ignores cached entries and re-searches everything
+        self._refresh_cache = os.getenv('SEARCH_CACHE_REFRESH') == '1'
+        self._search_cache_file = os.path.join(config_manager.app_dir, 'search_cache.jsonl')
+        self._cache_capacity = 2048  # Least recently used terms are dropped beyond this
+        self._search_cache = self._load_search_cache()
+        # New entries are appended as JSON lines and flushed in batches
+        self._cache_fh = None
+        self._cache_writes = 0
+        self._cache_flush_every = 50
+
+        # Plain HTTP session for result pages; disabled once a page needs JavaScript
+        self._session = None
+        self._static_fetch = requests is not None
+
     def execute_search_with_retries(self, category, subcategory, search_term, max_attempts=3):
         """
         Execute search with retries
@@ -39,31 +131,45 @@ class SearchExecutionManager:
         Returns:
             tuple: (success_status, urls_list)
         """
-        self.config_manager.log_message(f"\n=== Starting search for {category}/{subcategory} ===")
+        logger.info("\n=== Starting search for %s/%s ===", category, subcategory)
         
         for attempt in range(max_attempts):
             try:
-                self.config_manager.log_message(f"Attempt {attempt + 1} of {max_attempts}")
+                logger.info("Attempt %d of %d", attempt + 1, max_attempts)
                 
                 success, urls = self.execute_single_search(category, subcategory, search_term)
                 
                 if success and urls:
-                    self.config_manager.log_message(f"Successfully found URLs on attempt {attempt + 1}")
+                    logger.info("Successfully found URLs on attempt %d", attempt + 1)
                     return True, urls
                 
+                if urls is None:
+                    logger.info("No results for this term, not retrying")
+                    return False, []
+                
                 # If not successful and not last attempt, wait before retry
                 if attempt < max_attempts - 1:
-                    self.config_manager.log_message(f"No URLs found, waiting before retry...")
-                    time.sleep(5)  # Wait between attempts
+                    logger.info("No URLs found, waiting before retry...")
+                    time.sleep(self.retry_delay(attempt))
                 
             except Exception as e:
-                self.config_manager.log_message(f"Error in search attempt {attempt + 1}: {str(e)}")
+                logger.error("Error in search attempt %d: %s", attempt + 1, e)
                 if attempt < max_attempts - 1:
-                    time.sleep(5)  # Wait before retry
+                    time.sleep(self.retry_delay(attempt))
         
-        self.config_manager.log_message(f"No URLs found after {max_attempts} attempts")
+        logger.info("No URLs found after %d attempts", max_attempts)
         return False, []
 
+    def retry_delay(self, attempt):
+        """
+        Exponential backoff with jitter between search attempts
+        Args:
+            attempt: Zero-based index of the attempt that just failed
+        Returns:
+            float: Seconds to wait before the next attempt
+        """
+        return min(30, 2 ** attempt + random.random())
+
     def execute_single_search(self, category, subcategory, search_term):
         """
         Execute single search attempt
@@ -72,34 +178,37 @@ class SearchExecutionManager:
             subcategory: Current subcategory
             search_term: Term to search
         Returns:
-            tuple: (success_status, urls_list)
+            tuple: (success_status, urls_list); urls_list is None when the site
+            reports no results, which a retry would not change
         """
         try:
-            self.config_manager.log_message(f"Executing search with term: {search_term}")
+            logger.info("Executing search with term: %s", search_term)
             print(f"\nSearching for: {search_term}")
             print(f"Category: {category}, Subcategory: {subcategory}")
             
-            # Navigate to search page
-            self.driver.get('https://www.scribd.com/search')
+            # Links cached for this term skip the page load, unless none of them are new
+            hrefs = self._get_cached_hrefs(search_term)
+            urls = self.collect_document_urls(category, subcategory, hrefs) if hrefs else []
             
-            # Find and clear search input
-            search_input = WebDriverWait(self.driver, self.search_config['wait_time']).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, 'input[type="search"]'))
-            )
-            search_input.clear()
-            
-            # Input search term
-            search_input.send_keys(search_term)
-            search_input.send_keys(Keys.RETURN)
-            
-            # Wait for results
-            time.sleep(self.search_config['search_delay'])
-            
-            # Get and filter URLs
-            urls = self.collect_document_urls(category, subcategory)
+            if not urls:
+                hrefs = self._search_live(search_term)
+                if hrefs is None:
+                    # A clean "No results" page will look the same on every retry
+                    logger.info("Search returned no results for: %s", search_term)
+                    print("No results for this search term")
+                    self.progress_tracker.update_search_progress(
+                        category=category,
+                        subcategory=subcategory,
+                        success=False
+                    )
+                    return False, None
+                self._cache_hrefs(search_term, hrefs)
+                
+                # Get and filter URLs
+                urls = self.collect_document_urls(category, subcategory, hrefs)
             
             if urls:
-                self.config_manager.log_message(f"Found {len(urls)} URLs: {urls}")
+                logger.info("Found %d URLs: %s", len(urls), urls)
                 print(f"Found {len(urls)} new documents")
                 self.progress_tracker.update_search_progress(
                     category=category,
@@ -108,7 +217,7 @@ class SearchExecutionManager:
                 )
                 return True, urls
             
-            self.config_manager.log_message("No URLs found in search results")
+            logger.info("No URLs found in search results")
             print("No new results found")
             self.progress_tracker.update_search_progress(
                 category=category,
@@ -118,33 +227,249 @@ class SearchExecutionManager:
             return False, []
             
         except Exception as e:
-            self.config_manager.log_message(f"Error executing search: {str(e)}")
+            logger.error("Error executing search: %s", e)
             return False, []
             
-    def collect_document_urls(self, category, subcategory):
-        """Collect and filter document URLs"""
+    def _search_live(self, search_term):
+        """
+        Load the result page for a term, over plain HTTP if possible, else in the browser
+        Args:
+            search_term: Term to search
+        Returns:
+            list: Document hrefs, or None if the site reports no results
+        """
+        # Try the plain HTML page first; the browser is only needed if it renders nothing
+        hrefs = self._fetch_page_static(search_term) if self._static_fetch else None
+        if hrefs:
+            return hrefs
+        
+        # Reuse the open search page; reload it only if we left it or its input went stale
+        for attempt in range(2):
+            try:
+                if attempt or urlsplit(self.driver.current_url).path != '/search':
+                    self.driver.get('https://www.scribd.com/search')
+                
+                # Find and clear search input once it can actually take input
+                search_input = self._wait.until(
+                    EC.element_to_be_clickable(self._SEARCH_INPUT_LOCATOR)
+                )
+                search_input.clear()
+                search_input.send_keys(Keys.CONTROL, 'a', Keys.DELETE)
+                
+                # Remember a link from the previous query so we don't read stale results
+                previous_results = self.driver.find_elements(By.CSS_SELECTOR, self._LINK_SELECTOR)
+                
+                # Input search term
+                search_input.send_keys(search_term, Keys.RETURN)
+                break
+            except StaleElementReferenceException:
+                if attempt:
+                    raise
+                logger.info("Search input went stale, reloading the search page")
+        
+        # Wait for results
+        results = self.wait_for_results(previous_results[0] if previous_results else None)
+        return None if results['empty'] else results['hrefs']
+
+    def _load_search_cache(self):
+        """
+        Fold the append-only cache file into an LRU dict, keeping the newest entry per key
+        Returns:
+            OrderedDict: Unexpired entries keyed by _cache_key, oldest first
+        """
+        cache = {}
+        lines = 0
+        try:
+            if os.path.exists(self._search_cache_file):
+                loads = orjson.loads if orjson else json.loads
+                with open(self._search_cache_file, 'rb') as f:
+                    for line in f:
+                        lines += 1
+                        try:
+                            entry = loads(line)
+                            # The TTL filter and sort below run outside this try
+                            if not isinstance(entry.get('time'), (int, float)) or not isinstance(entry.get('hrefs'), list):
+                                continue
+                            cache[entry['key']] = entry
+                        except (ValueError, KeyError, TypeError, AttributeError):
+                            continue  # A torn last line from an interrupted run
+        except Exception as e:
+            logger.warning("Error loading search cache: %s", e)
+            return collections.OrderedDict()
+        
+        # Order by age so the newest entries survive the capacity limit
+        now = time.time()
+        live = sorted(
+            (entry for entry in cache.values() if now - entry['time'] < self.search_config['cache_ttl']),
+            key=lambda entry: entry['time']
+        )
+        cache = collections.OrderedDict(
+            (entry['key'], entry) for entry in live[-self._cache_capacity:]
+        )
+        
+        # Rewrite the file once superseded and expired lines outnumber live ones
+        if lines > 2 * len(cache):
+            try:
+                tmp_file = self._search_cache_file + '.tmp'
+                with open(tmp_file, 'wb') as f:
+                    f.writelines(self._dump_cache_entry(entry) for entry in cache.values())
+                os.replace(tmp_file, self._search_cache_file)
+            except Exception as e:
+                logger.warning("Error compacting search cache: %s", e)
+        return cache
+
+    @staticmethod
+    def _dump_cache_entry(entry):
+        """Serialize one cache entry as a JSON line"""
+        if orjson:
+            return orjson.dumps(entry, option=orjson.OPT_APPEND_NEWLINE)
+        return (json.dumps(entry) + '\n').encode('utf-8')
+
+    def _get_cached_hrefs(self, search_term):
+        """
+        Get result links cached for a term within the cache TTL
+        Args:
+            search_term: Term to search
+        Returns:
+            list: Cached hrefs, or None on a miss or an expired entry
+        """
+        if self._refresh_cache:
+            return None
+        try:
+            key = self._cache_key(search_term)
+            entry = self._search_cache.get(key)
+            if entry and time.time() - entry['time'] < self.search_config['cache_ttl']:
+                self._search_cache.move_to_end(key)
+                logger.info("Using cached results for: %s", search_term)
+                return entry['hrefs']
+        except Exception as e:
+            logger.warning("Error reading search cache: %s", e)
+        return None
+
+    @staticmethod
+    def _cache_key(search_term):
+        """Fixed-length cache key for a search term; case and outer whitespace are ignored"""
+        return hashlib.sha1(search_term.strip().lower().encode('utf-8')).hexdigest()
+
+    def _cache_hrefs(self, search_term, hrefs):
+        """
+        Cache the result links of a live search
+        Args:
+            search_term: Term to search
+            hrefs: Document hrefs read from the result page
+        """
+        if not hrefs:
+            return
+        entry = {'key': self._cache_key(search_term), 'time': time.time(), 'hrefs': list(hrefs)}
+        self._search_cache[entry['key']] = entry
+        self._search_cache.move_to_end(entry['key'])
+        while len(self._search_cache) > self._cache_capacity:
+            self._search_cache.popitem(last=False)
         try:
-            elements = self.driver.find_elements(
-                By.CSS_SELECTOR, 'a[class^="FluidCell-module_linkOverlay"]'
+            if self._cache_fh is None:
+                self._cache_fh = open(self._search_cache_file, 'ab')
+                atexit.register(self._cache_fh.close)
+            self._cache_fh.write(self._dump_cache_entry(entry))
+            
+            self._cache_writes += 1
+            if self._cache_writes >= self._cache_flush_every:
+                self._cache_fh.flush()
+                self._cache_writes = 0
+        except Exception as e:
+            logger.warning("Error writing search cache: %s", e)
+
+    def wait_for_results(self, previous_result=None):
+        """
+        Wait until the search shows result links or a no-results message
+        Args:
+            previous_result: A result link from the previous query, if any
+        Returns:
+            dict: The page read that satisfied the wait, as returned by _read_results;
+            no links if the previous results never cleared
+        """
+        if previous_result is not None:
+            try:
+                self._results_wait.until(EC.staleness_of(previous_result))
+            except TimeoutException:
+                # The page still shows the previous query's results; reading them
+                # would file another term's links under this one
+                logger.warning("Timed out waiting for the previous results to clear")
+                return {'found': 0, 'empty': False, 'hrefs': []}
+        try:
+            # The predicate hands back the page read itself, so callers need no second read
+            return self._results_wait.until(lambda d: self._ready_results())
+        except TimeoutException:
+            logger.warning("Timed out waiting for search results")
+            return self._read_results()
+
+    def _read_results(self):
+        """
+        Read the current result page in a single script call
+        Returns:
+            dict: 'found' link count, 'empty' no-results flag and document 'hrefs'
+        """
+        return self.driver.execute_script(self._READ_RESULTS_SCRIPT)
+
+    def _ready_results(self):
+        """
+        Read the result page if it has rendered links or the no-results message
+        Returns:
+            dict: The page read, or False while the page is still loading
+        """
+        results = self._read_results()
+        return results if results['found'] > 0 or results['empty'] else False
+
+    def _fetch_page_static(self, search_term):
+        """
+        Fetch result links over plain HTTP using the browser's session cookies
+        Args:
+            search_term: Term to search
+        Returns:
+            list: Document hrefs, empty if this term has to go through the browser
+        """
+        try:
+            if self._session is None:
+                self._session = requests.Session()
+                self._session.headers['User-Agent'] = self.driver.execute_script('return navigator.userAgent;')
+                for cookie in self.driver.get_cookies():
+                    self._session.cookies.set(cookie['name'], cookie['value'], domain=cookie.get('domain'))
+            
+            response = self._session.get(
+                build_search_url(search_term),
+                timeout=self.search_config['wait_time']
             )
+            response.raise_for_status()
+            
+            page = lxml.html.fromstring(response.content, base_url=response.url)
+            page.make_links_absolute()
+            links = page.xpath(self._LINK_XPATH + '/@href')
+        except Exception as e:
+            # Timeouts, 429s and 5xx only affect this term
+            logger.warning("Static fetch failed, using the browser for this search: %s", e)
+            return []
+        
+        if not links:
+            # No result anchors at all means the page is rendered by JavaScript
+            logger.info("Static result page had no result links, using the browser for searches")
+            self._static_fetch = False
+            return []
+        
+        is_document = self._DOC_URL_RE.match
+        return [href for href in links if is_document(href)]
+
+    def collect_document_urls(self, category, subcategory, hrefs=None):
+        """Collect and filter document URLs"""
+        try:
+            if hrefs is None:
+                # Match, read and filter document hrefs in the browser in one round-trip
+                hrefs = self._read_results()['hrefs']
             
-            new_urls = []
-            for element in elements:
-                try:
-                    url = element.get_attribute('href')
-                    if (url and 
-                        'www.scribd.com/document/' in url and 
-                        not self.url_manager.is_processed(url)):
-                        new_urls.append(url)
-                        
-                        if len(new_urls) >= self.search_config['max_results']:
-                            break
-                            
-                except Exception as e:
-                    print(f"Error getting URL: {str(e)}")
-                    continue
-                    
-            return new_urls
+            # Canonical forms collapse tracking-query variants of the same document;
+            # dict.fromkeys then drops repeats while keeping page order
+            candidate_urls = list(dict.fromkeys(map(canonicalize_url, hrefs)))
+            processed = self.url_manager.are_processed(candidate_urls)
+            new_urls = [url for url in candidate_urls if url not in processed]
+            return new_urls[:self.search_config['max_results']]
             
         except Exception as e:
             print(f"Error collecting URLs: {str(e)}")
@@ -160,26 +485,16 @@ class SearchExecutionManager:
             bool: Validation status
         """
         try:
-            results_container = WebDriverWait(self.driver, self.search_config['wait_time']).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, 'div[class*="search-results"]'))
+            self._wait.until(
+                EC.visibility_of_element_located(self._RESULTS_LOCATOR)
             )
             
-            # Check for no results
-            try:
-                no_results = self.driver.find_element(By.XPATH, "//div[contains(text(), 'No results for')]")
-                if no_results:
-                    return False
-            except:
-                pass
-            
-            # Get all results
-            results = results_container.find_elements(By.CSS_SELECTOR, 'a[class^="FluidCell-module_linkOverlay"]')
+            # The no-results check and the links come from the same page read
+            results = self._read_results()
+            if results['empty']:
+                return False
             
-            # Filter out processed URLs
-            new_results = [
-                result for result in results 
-                if not self.url_manager.is_processed(result.get_attribute('href'))
-            ]
+            new_results = self.collect_document_urls(category, subcategory, results['hrefs'])
             
             return len(new_results) >= self.search_config['min_results']
             
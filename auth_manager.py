@@ -23,6 +23,10 @@ import os
 # Load environment variables from .env file
 load_dotenv()
 class AuthManager:
+    SIGN_OUT_LOCATOR = (By.CSS_SELECTOR, 'a.sign_out_button')
+    OTP_INPUT_LOCATOR = (By.CSS_SELECTOR, 'input[name="code"]')
+    LOGIN_ERROR_LOCATOR = (By.CSS_SELECTOR, 'div.error')
+
     def __init__(self, driver, config_manager):
         """
         Initialize Authentication Manager
@@ -34,15 +38,15 @@ class AuthManager:
         self.driver = driver
         self.config_manager = config_manager
         self.wait_time = 10
+        self.wait = WebDriverWait(self.driver, self.wait_time)
         self.credentials = {
             'username': os.getenv('EMAIL_USERNAME'),
             'password': os.getenv('EMAIL_PASSWORD')
         }
 
     def random_sleep(self):
-        """Add random delay between actions"""
-        sleep_time = random.randint(3, 8)
-        time.sleep(sleep_time)
+        """Add a short random jitter between retries; page readiness is handled by explicit waits"""
+        time.sleep(random.uniform(0.3, 1.0))
 
     def check_login_status(self):
         """
@@ -51,7 +55,7 @@ class AuthManager:
         """
         try:
             wait = WebDriverWait(self.driver, 5)
-            wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, 'a.sign_out_button')))
+            wait.until(EC.presence_of_element_located(self.SIGN_OUT_LOCATOR))
             self.config_manager.log_message('Already logged in, proceeding to search page.')
             return True
         except (TimeoutException, NoSuchElementException):
@@ -61,29 +65,84 @@ class AuthManager:
     def handle_captcha(self):
         """Handle CAPTCHA verification"""
         try:
-            iframe = self.driver.find_element(By.CSS_SELECTOR, 'iframe[title="reCAPTCHA"]')
-            self.driver.switch_to.frame(iframe)
-            self.driver.find_element(By.CSS_SELECTOR, '.recaptcha-checkbox-border').click()
+            # The reCAPTCHA iframe is injected after DOMContentLoaded; wait briefly so
+            # logins without a CAPTCHA don't sit out the full wait_time
+            WebDriverWait(self.driver, 3).until(EC.frame_to_be_available_and_switch_to_it(
+                (By.CSS_SELECTOR, 'iframe[title="reCAPTCHA"]')
+            ))
+            self.wait.until(
+                EC.element_to_be_clickable((By.CSS_SELECTOR, '.recaptcha-checkbox-border'))
+            ).click()
             self.config_manager.log_message('Clicked on CAPTCHA checkbox')
             self.driver.switch_to.default_content()
             return True
+        except TimeoutException:
+            self.driver.switch_to.default_content()
+            self.config_manager.log_message('No CAPTCHA found')
+            return False
         except Exception as e:
+            self.driver.switch_to.default_content()
             self.config_manager.log_message(f"Error clicking CAPTCHA: {str(e)}")
             return False
 
-    def handle_otp(self):
-        """Handle OTP verification"""
+    def wait_for_captcha_token(self, timeout=30):
+        """
+        Wait until reCAPTCHA has issued its response token
+        Args:
+            timeout: Maximum seconds to wait, matching the previous fixed delay
+        Returns: Boolean indicating whether a token appeared
+        """
         try:
-            # Wait for OTP input field
-            otp_input = WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, 'input[name="code"]'))
+            WebDriverWait(self.driver, timeout).until(
+                lambda driver: driver.execute_script(
+                    "const t = document.getElementById('g-recaptcha-response'); return !!(t && t.value);"
+                )
             )
+            self.config_manager.log_message('CAPTCHA solved')
+            return True
+        except TimeoutException:
+            self.config_manager.log_message(f'No CAPTCHA token after {timeout} seconds, continuing')
+            return False
+
+    def visible_login_error(self, driver):
+        """
+        Find a login error the page is actually showing
+        Args:
+            driver: Selenium WebDriver instance, as passed by WebDriverWait
+        Returns: The error element if it is visible and has text, otherwise False
+        """
+        try:
+            element = EC.visibility_of_element_located(self.LOGIN_ERROR_LOCATOR)(driver)
+        except NoSuchElementException:
+            return False
+        # An empty error container can be on the page before anything went wrong
+        return element if element and element.text.strip() else False
+
+    def handle_otp(self):
+        """
+        Handle OTP verification
+        Returns: Boolean indicating login success, with or without an OTP step
+        """
+        try:
+            # Race the OTP form against the signed-in page and a login error, so the
+            # outcome is known as soon as the site renders one of them
+            element = self.wait.until(EC.any_of(
+                EC.presence_of_element_located(self.OTP_INPUT_LOCATOR),
+                EC.presence_of_element_located(self.SIGN_OUT_LOCATOR),
+                self.visible_login_error
+            ))
+            if element.tag_name == 'a':
+                self.config_manager.log_message('Logged in without OTP verification')
+                return True
+            if element.tag_name == 'div':
+                self.config_manager.log_message(f'Login error shown: {element.text.strip()}')
+                return False
             self.config_manager.log_message('OTP input field found')
             
             # Wait for user to input OTP manually
             self.config_manager.log_message('Waiting for manual OTP input...')
             WebDriverWait(self.driver, 300).until(
-                lambda driver: driver.find_element(By.CSS_SELECTOR, 'input[name="code"]').get_attribute('value') != ''
+                lambda driver: driver.find_element(*self.OTP_INPUT_LOCATOR).get_attribute('value') != ''
             )
             self.config_manager.log_message('OTP entered')
 
@@ -93,9 +152,8 @@ class AuthManager:
             self.config_manager.log_message('Clicked verify button')
 
             # Wait for successful login confirmation
-            WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, 'a.sign_out_button'))
-            )
+            self.wait.until(EC.presence_of_element_located(self.SIGN_OUT_LOCATOR))
+            self.config_manager.log_message('Logged in after OTP verification')
             return True
 
         except TimeoutException:
@@ -118,10 +176,8 @@ class AuthManager:
             # Navigate to login page
             self.driver.get('https://auth.scribd.com/u/login')
             
-            # Wait for login form to be visible
-            wait = WebDriverWait(self.driver, self.wait_time)
-            
             # Enter credentials with explicit waits
+            wait = self.wait
             username_field = wait.until(EC.presence_of_element_located((By.ID, 'username')))
             username_field.send_keys(self.credentials['username'])
             self.config_manager.log_message('Entered username')
@@ -130,11 +186,9 @@ class AuthManager:
             password_field.send_keys(self.credentials['password'])
             self.config_manager.log_message('Entered password')
 
-            # Handle CAPTCHA if present
+            # Handle CAPTCHA if present, then wait only until it has been solved
             if self.handle_captcha():
-                time.sleep(30)  # Wait after CAPTCHA
-                self.config_manager.log_message('Waited for 30 seconds after CAPTCHA')
-                self.random_sleep()
+                self.wait_for_captcha_token()
 
             # Try multiple selectors for login button
             login_button_selectors = [
@@ -157,21 +211,22 @@ class AuthManager:
                 self.config_manager.log_message("Could not find login button with any selector")
                 return False
 
-            # Handle OTP if required
+            # Handle OTP if required; this also returns as soon as login succeeds without one
             if self.handle_otp():
-                self.config_manager.log_message('Successfully logged in after OTP verification')
+                self.config_manager.log_message('Successfully logged in')
                 return True
 
-            # Final login check with extended wait
-            try:
-                WebDriverWait(self.driver, 20).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, 'a.sign_out_button'))
-                )
+            # Final login check; handle_otp has already waited for the sign out button
+            if self.driver.find_elements(*self.SIGN_OUT_LOCATOR):
                 self.config_manager.log_message('Login successful - found sign out button')
                 return True
-            except TimeoutException:
+            
+            error = self.visible_login_error(self.driver)
+            if error:
+                self.config_manager.log_message(f'Login failed - {error.text.strip()}')
+            else:
                 self.config_manager.log_message('Login failed - could not verify successful login')
-                return False
+            return False
 
         except Exception as e:
             self.config_manager.log_message(f"Critical error during login: {str(e)}")
@@ -189,7 +244,7 @@ class AuthManager:
                 if self.perform_login():
                     return True
                 self.config_manager.log_message(f"Login attempt {attempt + 1} failed, retrying...")
-                time.sleep(5)
+                self.random_sleep()
             except Exception as e:
                 self.config_manager.log_message(f"Error in login attempt {attempt + 1}: {str(e)}")
         
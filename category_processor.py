@@ -1,7 +1,5 @@
-import json
-import os
 import time
-from typing import Dict, List, Any
+from typing import Dict, List
 class CategoryProcessor:
     def __init__(self, config_manager, download_manager, progress_tracker):
         """
@@ -1,17 +1,5 @@
 # config_manager.py
 """This ConfigManager class handles:
-
-Directory setup and management
-Configuration loading/saving
-Chrome options setup
-Logging functionality
-"""
-
-from selenium.webdriver.chrome.options import Options
-import os
-import json
-import datetime
-"""This ConfigManager class handles:
 Directory setup and management with category-subcategory structure
 Configuration loading/saving
 Chrome options setup
@@ -21,8 +9,11 @@ Logging functionality
 from selenium.webdriver.chrome.options import Options
 import os
 import json
+import logging
 import datetime
 
+logger = logging.getLogger(__name__)
+
 class ConfigManager:
     def __init__(self):
         # Base Directory Setup
@@ -41,6 +32,14 @@ class ConfigManager:
             f'session_log_{datetime.datetime.now().strftime("%Y%m%d_%H%M%S")}.txt'
         )
         
+        # Send every module's log records to the session log and the console
+        logging.basicConfig(
+            level=logging.INFO,
+            format='[%(asctime)s] %(message)s',
+            datefmt='%Y-%m-%d %H:%M:%S',
+            handlers=[logging.FileHandler(self.log_file), logging.StreamHandler()]
+        )
+        
         # Initialize config
         self.config = self.load_config()
         
@@ -60,16 +59,7 @@ class ConfigManager:
 
     def log_message(self, message):
         """Log a message with timestamp"""
-        try:
-            timestamp = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            log_entry = f'[{timestamp}] {message}\n'
-            
-            with open(self.log_file, 'a') as f:
-                f.write(log_entry)
-            print(log_entry.strip())  # Also print to console
-        except Exception as e:
-            print(f"Error writing to log: {str(e)}")
-            print(f"Message was: {message}")
+        logger.info(message)
 
     def setup_category_directory(self, category):
         """
@@ -152,6 +142,8 @@ class ConfigManager:
         chrome_options.add_argument('--disable-extensions')
         chrome_options.add_argument('--window-size=1920,1080')
         chrome_options.add_argument(f'--user-data-dir={self.user_data_dir}')
+        # Bigger HTTP cache in the persistent profile so site assets survive across runs
+        chrome_options.add_argument('--disk-cache-size=268435456')
         chrome_options.add_argument('--no-sandbox')
         chrome_options.add_argument('--disable-dev-shm-usage')
         chrome_options.add_argument('--remote-allow-origins=*')
@@ -159,6 +151,9 @@ class ConfigManager:
         chrome_options.add_argument('--disable-software-rasterizer')
         chrome_options.add_argument('--disable-blink-features=AutomationControlled')
         
+        # Return from navigation once the DOM is ready; explicit waits cover the rest
+        chrome_options.page_load_strategy = 'eager'
+        
         # Download preferences
         download_dir = self.current_download_dir or self.insurance_files_dir
         chrome_prefs = {
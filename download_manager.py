@@ -11,12 +11,15 @@ Error handling and logging
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
+from selenium.common.exceptions import TimeoutException
 
 import os
 import time
 import traceback
 import datetime
+import logging
+
+logger = logging.getLogger(__name__)
 
 
 class DownloadManager:
@@ -40,7 +43,7 @@ class DownloadManager:
             
             # Check if already downloaded
             if self.url_manager.is_processed(url):
-                self.config_manager.log_message("URL already processed, skipping")
+                logger.debug("URL already processed, skipping")
                 return False
             
             # Get current download directory
@@ -111,9 +114,6 @@ class DownloadManager:
                 self.config_manager.log_message("Failed to handle download modal")
                 return False
             
-            # Additional wait for download preferences to take effect
-            self.driver.implicitly_wait(2)
-            
             # Verify download and rename file
             file_info = self.verify_and_rename_file(cleaned_title, download_url, category, subcategory)
             
@@ -140,13 +140,13 @@ class DownloadManager:
                 current_downloads = self.progress_tracker.get_subcategory_downloads(category, subcategory)
                 self.config_manager.log_message(f"Current downloads for {subcategory}: {current_downloads}")
                 
-                # Check if we've reached 2 downloads
-                if current_downloads >= 2:
+                # Check if we've reached the required downloads
+                if current_downloads >= self.progress_tracker.required_downloads:
                     self.config_manager.log_message(f"Subcategory {subcategory} has reached required downloads")
                     self.progress_tracker.mark_subcategory_complete(category, subcategory)
                     
                     # Check if category is complete
-                    if self.progress_tracker.is_category_complete(category):
+                    if self.progress_tracker.check_category_completion(category):
                         self.config_manager.log_message(f"Category {category} completed")
                         self.config_manager.mark_category_complete(category)
                 
@@ -168,7 +168,9 @@ class DownloadManager:
     def get_document_title(self):
         """Extract and clean document title"""
         try:
-            title_element = self.driver.find_element(By.CSS_SELECTOR, '[data-e2e="doc_page_title"]')
+            title_element = self.wait.until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, '[data-e2e="doc_page_title"]'))
+            )
             document_title = title_element.text
             document_title = ''.join(c for c in document_title if c.isalnum() or c in ' -')
             document_title = ' '.join(document_title.split())
@@ -181,19 +183,17 @@ class DownloadManager:
     def find_and_click_download_button(self):
         """Find and click the download button"""
         try:
-            elements = self.driver.find_elements(
-                By.CSS_SELECTOR, 
-                '[data-e2e="doc-actions-download-button-doc_actions"]'
-            )
-            
-            if not elements:
+            # Navigation returns at DOMContentLoaded, so the button may not be rendered yet
+            try:
+                button = self.wait.until(EC.element_to_be_clickable(
+                    (By.CSS_SELECTOR, '[data-e2e="doc-actions-download-button-doc_actions"]')
+                ))
+            except TimeoutException:
                 self.config_manager.log_message("No download button found")
                 return False
                 
-            button = elements[0]
             self.driver.execute_script('arguments[0].style.color = "red";', button)
             self.driver.execute_script("arguments[0].scrollIntoView(true);", button)
-            time.sleep(1)
             
             try:
                 button.click()
@@ -4,7 +4,6 @@ with organized directory structure and simplified search mechanism.
 """
 import traceback
 from selenium.webdriver.remote.webdriver import WebDriver
-import time
 
 # Import managers
 from config_manager import ConfigManager
@@ -17,9 +16,9 @@ from ProgressTracker import ProgressTracker
 # Import utilities
 from insurance_data import INSURANCE_CATEGORIES
 from file_naming_convention import DocumentNameHandler
-from category_processor import CategoryProcessor
 from ProcessedURLManager import ProcessedURLManager
 from report import DownloadReportManager
+from rate_limiter import RateLimiter
 
 
 class ScribdScraper:
@@ -35,9 +34,6 @@ class ScribdScraper:
             # Initialize category tracking
             self.progress_tracker.initialize_category_tracking(INSURANCE_CATEGORIES)
             
-            # Get resume point
-            resume_point = self.progress_tracker.get_resume_point()
-            
             # Initialize tracking and management components
             self.name_handler = DocumentNameHandler(self.config_manager.log_file)
             self.url_manager = ProcessedURLManager(
@@ -48,6 +44,10 @@ class ScribdScraper:
             spreadsheet_id='1sbKp5Xa_NPd5Bp6MbaS_eaLlgLzsdX_t3jcms3zgXQ4'
             )
                     
+            # Keep downloads at least two seconds apart, and searches three
+            self.download_limiter = RateLimiter(min_interval=2)
+            self.search_limiter = RateLimiter(min_interval=3)
+                    
             # Setup WebDriver
             self.driver = self.setup_driver()
             
@@ -64,7 +64,6 @@ class ScribdScraper:
             
             # Initialize search components
             self.search_mechanism = SearchMechanism(INSURANCE_CATEGORIES)
-            current_search = self.search_mechanism.initialize_search(resume_point)
             self.search_executor = SearchExecutionManager(
                 driver=self.driver,
                 progress_tracker=self.progress_tracker,  # Explicitly name the parameter
@@ -117,6 +116,12 @@ class ScribdScraper:
                     subcategory = current_search['subcategory']
                     search_term = current_search['search_term']
                     
+                    # Check if subcategory is already complete; skipped items don't touch the saved position
+                    if self.progress_tracker.is_subcategory_complete(category, subcategory):
+                        self.config_manager.log_message(f"Subcategory {subcategory} already completed, skipping...")
+                        current_search = self.search_mechanism.move_to_next()
+                        continue
+                    
                     # Update progress tracker position
                     self.progress_tracker.update_position(
                         category=category,
@@ -125,12 +130,6 @@ class ScribdScraper:
                         subcategory_index=current_search['subcategory_index']
                     )
                     
-                    # Check if subcategory is already complete
-                    if self.progress_tracker.is_subcategory_complete(category, subcategory):
-                        self.config_manager.log_message(f"Subcategory {subcategory} already completed, skipping...")
-                        current_search = self.search_mechanism.move_to_next()
-                        continue
-                    
                     self.config_manager.log_message(f"\n=== Processing: {category} - {subcategory} ===")
                     self.config_manager.log_message(f"Search term: {search_term}")
                     
@@ -139,6 +138,7 @@ class ScribdScraper:
                     current_dir = self.config_manager.setup_subcategory_directory(category, subcategory)
                     
                     # Execute search
+                    self.search_limiter.wait()
                     search_success, found_urls = self.search_executor.execute_search_with_retries(
                         category,
                         subcategory,
@@ -147,12 +147,15 @@ class ScribdScraper:
                     
                     if search_success and found_urls:
                         self.config_manager.log_message(f"Found {len(found_urls)} URLs to process")
-                        downloaded_count = 0
                         
+                        # Count toward the requirement locally instead of re-reading the tracker;
+                        # download_manager records each download and marks the subcategory complete
+                        required = self.progress_tracker.required_downloads
+                        done = self.progress_tracker.get_subcategory_downloads(category, subcategory)
+                        
+                        # Search results are already filtered against processed URLs
                         for url in found_urls:
-                            if self.url_manager.is_processed(url):
-                                continue
-                                
+                            self.download_limiter.wait()
                             success = self.download_manager.download_document(
                                 url,
                                 category,
@@ -160,27 +163,18 @@ class ScribdScraper:
                             )
                             
                             if success:
-                                downloaded_count += 1
-                                # Don't record download here since it's already done in download_manager
-                                
-                                # Check if we've reached 2 downloads
-                                if downloaded_count >= 2:
-                                    self.progress_tracker.mark_subcategory_complete(category, subcategory)
+                                done += 1
+                                if done >= required:
                                     break
-                            
-                            time.sleep(2)
                     
                     # Move to next search item
                     current_search = self.search_mechanism.move_to_next()
                     
                     # Check category completion
                     if current_search and current_search.get('is_last_subcategory'):
-                        if self.progress_tracker.is_category_complete(category):
-                            self.progress_tracker.check_category_completion(category)
+                        if self.progress_tracker.check_category_completion(category):
                             self.config_manager.log_message(f"Completed category: {category}")
                     
-                    time.sleep(3)
-                    
                 except Exception as e:
                     self.config_manager.log_message(f"Error processing search: {str(e)}")
                     current_search = self.search_mechanism.move_to_next()
@@ -220,9 +214,9 @@ class ScribdScraper:
         try:
             progress = self.search_mechanism.get_search_progress()
             url_stats = self.url_manager.get_stats()
-            download_stats = self.progress_tracker.print_stats()
+            download_stats = self.progress_tracker.format_stats()
             
-            final_stats = f"""
+            parts = [f"""
             === Final Processing Statistics ===
             Categories Processed: {progress['processed_categories']}/{progress['total_categories']}
             Subcategories Processed: {progress['processed_subcategories']}/{progress['total_subcategories']}
@@ -232,14 +226,14 @@ class ScribdScraper:
             {download_stats}
             
             URL Processing by Category:
-            """
+            """]
             
             for category, cat_stats in url_stats['categories'].items():
-                final_stats += f"\n{category}: {cat_stats['total']} URLs"
+                parts.append(f"\n{category}: {cat_stats['total']} URLs")
                 for subcat, count in cat_stats['subcategories'].items():
-                    final_stats += f"\n  - {subcat}: {count} URLs"
+                    parts.append(f"\n  - {subcat}: {count} URLs")
             
-            self.config_manager.log_message(final_stats)
+            self.config_manager.log_message(''.join(parts))
         except Exception as e:
             self.config_manager.log_message(f"Error printing final stats: {str(e)}")
 
@@ -247,6 +241,7 @@ class ScribdScraper:
         """Cleanup resources"""
         try:
             self.driver.quit()
+            self.progress_tracker.flush()
             self.url_manager.cleanup()
             self.config_manager.log_message("Browser session ended, log file closed.")
         except Exception as e:
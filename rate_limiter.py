@@ -0,0 +1,25 @@
+import threading
+import time
+
+
+class RateLimiter:
+    def __init__(self, min_interval):
+        """
+        Initialize RateLimiter
+        Args:
+            min_interval: Minimum number of seconds between two calls
+        """
+        self.min_interval = min_interval
+        self._last_call = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        """
+        Block until at least min_interval has passed since the previous call.
+        Only the remainder is slept, so slow work between calls costs no extra delay.
+        """
+        with self._lock:
+            remaining = self._last_call + self.min_interval - time.monotonic()
+            if remaining > 0:
+                time.sleep(remaining)
+            self._last_call = time.monotonic()
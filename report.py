@@ -1,13 +1,7 @@
 import pandas as pd
-from openpyxl import load_workbook
 from datetime import datetime
 import os
 import math
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from google.auth.transport.requests import Request
-from googleapiclient.discovery import build
-import pickle
 from google_sheet import GoogleSheetsSync
 
 
@@ -10,6 +10,9 @@ class SearchMechanism:
         self.current_category_index = 0
         self.current_subcategory_index = 0
         self.search_completed = False
+        self._search_terms = {}  # Format: {'subcategory': 'formatted search term'}
+        # Category names as they appear at the start of a formatted term
+        self._category_prefixes = [category.replace('_', ' ').lower() for category in self.category_list]
         
     def initialize_search(self, resume_point=None):
         """
@@ -43,7 +46,7 @@ class SearchMechanism:
         return {
             'category': current_category,
             'subcategory': current_subcategory,
-            'search_term': self._format_search_term(current_subcategory),
+            'search_term': self._get_search_term(current_subcategory),
             'is_last_subcategory': self.is_last_subcategory(),
             'is_last_category': self.is_last_category(),
             'category_index': self.current_category_index,
@@ -51,6 +54,19 @@ class SearchMechanism:
         }
     
     
+    def _get_search_term(self, subcategory):
+        """
+        Get the formatted search term for a subcategory, formatting it only once
+        Args:
+            subcategory: Subcategory name
+        Returns:
+            str: Formatted search term
+        """
+        search_term = self._search_terms.get(subcategory)
+        if search_term is None:
+            search_term = self._search_terms[subcategory] = self._format_search_term(subcategory)
+        return search_term
+
     def _format_search_term(self, term):
         """
         Format subcategory for search
@@ -63,15 +79,19 @@ class SearchMechanism:
         term = term.replace('_', ' ')
         term = ' '.join(term.split())
         
+        # Lowercase once and only redo it when the term actually changes
+        term_lc = term.lower()
+        
         # Add 'insurance' if not present
-        if 'insurance' not in term.lower():
+        if 'insurance' not in term_lc:
             term += ' insurance'
+            term_lc += ' insurance'
             
         # Remove category prefix if present
-        for category in self.category_list:
-            category_name = category.replace('_', ' ').lower()
-            if term.lower().startswith(category_name):
+        for category_name in self._category_prefixes:
+            if term_lc.startswith(category_name):
                 term = term[len(category_name):].strip()
+                term_lc = term.lower()
         
         return term.strip()
     